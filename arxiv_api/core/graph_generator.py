@@ -10,5 +10,5 @@ class GraphGenerator:
         graph = GraphClient.build_collaboration_network(author_name, max_depth)
         edge_list = [{"source": u, "target": v} for u, v in graph.edges()]
 
-        return json.dumps(edge_list, indent=2)
+        return json.dumps(edge_list, separators=(",", ":"))
 
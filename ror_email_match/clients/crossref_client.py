@@ -1,4 +1,12 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from ror_email_match.clients.http_session import USER_AGENT, create_cached_session
 
 """
       |   
@@ -15,17 +23,35 @@ class CrossrefClient:
     A client for fetching organization metadata from the Crossref API using FundRef identifiers.
     """
 
-    def __init__(self):
+    def __init__(self, mailto=None):
         """
-        Initialize the CrossrefClient.
+        Initialize the CrossrefClient with a persistent HTTP session.
+
+        Successful responses are cached on disk for a day, so repeated lookups of the same
+        funder do not reach the Crossref API.
+
+        When a contact email is configured, it is sent in the User-Agent header and as the
+        'mailto' query parameter so that requests are served from Crossref's polite pool.
 
         Parameters:
-            None
+            mailto (str, optional): Contact email address for the Crossref polite pool.
+                                   Defaults to the CROSSREF_MAILTO environment variable.
 
         Returns:
             None
         """
-        pass
+        self.mailto = mailto or os.environ.get("CROSSREF_MAILTO")
+
+        self.session = create_cached_session()
+        if self.mailto:
+            self.session.headers.update({"User-Agent": f"{USER_AGENT} (mailto:{self.mailto})"})
+
+        self.max_workers = 8
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=self.max_workers))
+
+        self._rate_limit_lock = threading.Lock()
+        self._request_interval = 0.0
+        self._next_request_time = 0.0
 
     def fetch_crossref_data(self, crossref_id):
         """
@@ -49,7 +75,14 @@ class CrossrefClient:
 
         try:
             crossref_url = f"https://api.crossref.org/funders/{crossref_id}"
-            response = requests.get(crossref_url)
+            params = {"mailto": self.mailto} if self.mailto else None
+
+            # Cached responses are served without counting against the rate limit
+            response = self.session.get(crossref_url, params=params, timeout=10, only_if_cached=True)
+            if response.status_code != 200:
+                self._wait_for_rate_limit()
+                response = self.session.get(crossref_url, params=params, timeout=10)
+                self._update_rate_limit(response.headers)
 
             if response.status_code == 200:
                 return response.json().get('message', {})
@@ -59,3 +92,73 @@ class CrossrefClient:
         except requests.RequestException as e:
             print(f"Error connecting to Crossref API: {e}")
             return None
+
+    def _wait_for_rate_limit(self):
+        """
+        Block until the next request is allowed by the advertised Crossref rate limit.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            wait = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + self._request_interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def _update_rate_limit(self, headers):
+        """
+        Adapt the request interval to the X-Rate-Limit-* headers returned by Crossref.
+
+        Parameters:
+            headers (dict): Response headers from the Crossref API.
+
+        Returns:
+            None
+        """
+        limit = headers.get("X-Rate-Limit-Limit")
+        interval = headers.get("X-Rate-Limit-Interval")
+        if not limit or not interval:
+            return
+
+        try:
+            limit = int(limit)
+            interval = float(interval.rstrip("s"))
+        except ValueError:
+            return
+
+        if limit > 0:
+            with self._rate_limit_lock:
+                self._request_interval = interval / limit
+
+    def fetch_crossref_data_batch(self, crossref_ids):
+        """
+        Fetch organization data from the Crossref API for multiple Crossref IDs.
+
+        Duplicate IDs and 'N/A' placeholders are skipped, so each distinct funder is
+        requested only once. Lookups run concurrently over the shared session.
+
+        Parameters:
+            crossref_ids (list[str]): The Crossref identifiers for the organizations.
+
+        Returns:
+            dict[str, dict]: Mapping of Crossref ID to organization metadata dictionary,
+                            as returned by fetch_crossref_data(). IDs whose lookup
+                            failed are omitted.
+        """
+        crossref_ids = [crossref_id for crossref_id in dict.fromkeys(crossref_ids) if crossref_id != 'N/A']
+        if not crossref_ids:
+            return {}
+
+        crossref_data = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(crossref_ids))) as executor:
+            for crossref_id, data in zip(crossref_ids, executor.map(self.fetch_crossref_data, crossref_ids)):
+                if data:
+                    crossref_data[crossref_id] = data
+
+        return crossref_data
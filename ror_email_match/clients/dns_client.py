@@ -1,5 +1,12 @@
+import functools
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import dns.exception
 import dns.resolver
-import urllib.parse
+import tldextract
 
 """
       |   
@@ -10,6 +17,88 @@ import urllib.parse
       =
 """
 
+# Shared resolver, so repeated lookups are answered from its cache
+_RESOLVER = dns.resolver.Resolver()
+_RESOLVER.cache = dns.resolver.LRUCache(max_size=10_000)
+_RESOLVER.lifetime = 3.0
+_RESOLVER.timeout = 1.0
+
+# Splits a domain or URL into subdomain, domain and suffix using the bundled public suffix list,
+# memoized per input. Shared by the ROR client and the match scorer.
+extract_domain = functools.lru_cache(maxsize=50_000)(tldextract.TLDExtract(suffix_list_urls=()))
+
+# Host part of a URL with optional http(s) scheme and leading 'www.' removed
+_URL_DOMAIN_RE = re.compile(r'^(?:https?://)?(?:www\.)?([^/?#]+)', re.IGNORECASE)
+
+# Processed lookup results keyed by (lookup name, domain), stored as (expiry, value)
+_DNS_CACHE = {}
+_DNS_CACHE_LOCK = threading.Lock()
+_DNS_CACHE_TTL = 300
+_DNS_CACHE_MAX_SIZE = 10_000
+
+# Resolver errors that are definitive answers about the domain, as opposed to timeouts
+# and server failures
+_DEFINITIVE_DNS_ERRORS = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.SyntaxError)
+
+
+def _dns_cached(failure_value):
+    """
+    Cache the result of a DNS lookup method per domain for _DNS_CACHE_TTL seconds.
+
+    Lookups that raise (timeouts, server failures) are not cached; the wrapper returns
+    failure_value for them so the next call queries the resolver again.
+
+    Parameters:
+        failure_value (list or None): Value returned when the lookup raises.
+
+    Returns:
+        callable: Decorator for DNSAnalyzer methods taking a single domain argument.
+    """
+    def decorator(lookup):
+        @functools.wraps(lookup)
+        def wrapper(self, domain):
+            key = (lookup.__name__, domain)
+            now = time.monotonic()
+
+            with _DNS_CACHE_LOCK:
+                entry = _DNS_CACHE.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+
+            try:
+                value = lookup(self, domain)
+            except Exception:
+                return failure_value
+
+            with _DNS_CACHE_LOCK:
+                if len(_DNS_CACHE) >= _DNS_CACHE_MAX_SIZE:
+                    _prune_dns_cache(now)
+                _DNS_CACHE.pop(key, None)
+                _DNS_CACHE[key] = (now + _DNS_CACHE_TTL, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _prune_dns_cache(now):
+    """
+    Drop expired entries from _DNS_CACHE, then the oldest ones while it is still full.
+
+    Must be called with _DNS_CACHE_LOCK held.
+
+    Parameters:
+        now (float): Current time.monotonic() value.
+
+    Returns:
+        None
+    """
+    for key in [key for key, (expiry, _) in _DNS_CACHE.items() if expiry <= now]:
+        del _DNS_CACHE[key]
+    while len(_DNS_CACHE) >= _DNS_CACHE_MAX_SIZE:
+        del _DNS_CACHE[next(iter(_DNS_CACHE))]
+
 
 class DNSAnalyzer:
     """
@@ -40,11 +129,14 @@ class DNSAnalyzer:
         """
         return email.split('@')[-1]
 
-    def get_domain_from_url(self, url):
+    @staticmethod
+    @functools.lru_cache(maxsize=10_000)
+    def get_domain_from_url(url):
         """
         Extract and normalize the domain from a URL.
 
         Handles URLs with or without protocol prefixes and removes 'www.' subdomain if present.
+        Results are memoized per URL.
 
         Parameters:
             url (str): The URL to parse. Can include or omit http/https protocol.
@@ -52,12 +144,10 @@ class DNSAnalyzer:
         Returns:
             str: The normalized domain name.
         """
-        if not url.startswith(('http://', 'https://')):
-            url = 'http://' + url
-        parsed = urllib.parse.urlparse(url)
-        domain = parsed.netloc or parsed.path
-        return domain.lstrip('www.') if domain.startswith('www.') else domain
+        match = _URL_DOMAIN_RE.match(url)
+        return match.group(1) if match else ''
 
+    @_dns_cached([])
     def get_ns_records(self, domain):
         """
         Retrieve the NS (Name Server) records for a domain.
@@ -70,11 +160,12 @@ class DNSAnalyzer:
                       Returns empty list if query fails.
         """
         try:
-            answers = dns.resolver.resolve(domain, 'NS')
+            answers = _RESOLVER.resolve(domain, 'NS')
             return [str(r.target).rstrip('.') for r in answers]
-        except Exception:
+        except _DEFINITIVE_DNS_ERRORS:
             return []
 
+    @_dns_cached([])
     def get_a_records(self, domain):
         """
         Retrieve the A records (IPv4 addresses) for a domain.
@@ -86,11 +177,12 @@ class DNSAnalyzer:
             list[str]: List of IPv4 addresses. Returns empty list if query fails.
         """
         try:
-            answers = dns.resolver.resolve(domain, 'A')
+            answers = _RESOLVER.resolve(domain, 'A')
             return [str(r.address) for r in answers]
-        except Exception:
+        except _DEFINITIVE_DNS_ERRORS:
             return []
 
+    @_dns_cached([])
     def get_aaaa_records(self, domain):
         """
         Retrieve the AAAA records (IPv6 addresses) for a domain.
@@ -102,11 +194,12 @@ class DNSAnalyzer:
             list[str]: List of IPv6 addresses. Returns empty list if query fails.
         """
         try:
-            answers = dns.resolver.resolve(domain, 'AAAA')
+            answers = _RESOLVER.resolve(domain, 'AAAA')
             return [str(r.address) for r in answers]
-        except Exception:
+        except _DEFINITIVE_DNS_ERRORS:
             return []
 
+    @_dns_cached(None)
     def get_cname_record(self, domain):
         """
         Retrieve the CNAME record for a domain.
@@ -119,11 +212,12 @@ class DNSAnalyzer:
                         or None if no CNAME record exists or query fails.
         """
         try:
-            answers = dns.resolver.resolve(domain, 'CNAME')
+            answers = _RESOLVER.resolve(domain, 'CNAME')
             return str(answers[0].target).rstrip('.')
-        except Exception:
+        except _DEFINITIVE_DNS_ERRORS:
             return None
 
+    @_dns_cached([])
     def get_mx_records(self, domain):
         """
         Retrieve the MX (Mail Exchange) records for a domain.
@@ -136,11 +230,12 @@ class DNSAnalyzer:
                       Returns empty list if query fails.
         """
         try:
-            answers = dns.resolver.resolve(domain, 'MX')
+            answers = _RESOLVER.resolve(domain, 'MX')
             return sorted([str(r.exchange).rstrip('.') for r in answers])
-        except Exception:
+        except _DEFINITIVE_DNS_ERRORS:
             return []
 
+    @_dns_cached(None)
     def get_soa_email(self, domain):
         """
         Retrieve the SOA (Start of Authority) responsible person email for a domain.
@@ -153,11 +248,12 @@ class DNSAnalyzer:
                         or None if query fails.
         """
         try:
-            answers = dns.resolver.resolve(domain, 'SOA')
+            answers = _RESOLVER.resolve(domain, 'SOA')
             return str(answers[0].rname).rstrip('.')
-        except Exception:
+        except _DEFINITIVE_DNS_ERRORS:
             return None
 
+    @_dns_cached([])
     def get_txt_records(self, domain):
         """
         Retrieve all TXT records for a domain.
@@ -166,47 +262,52 @@ class DNSAnalyzer:
             domain (str): The domain to query.
 
         Returns:
-            list[list[bytes]]: List of TXT record string lists. Each TXT record can contain
-                              multiple strings. Returns empty list if query fails.
+            list[str]: List of decoded TXT records. Records split into multiple character
+                      strings (e.g. SPF records longer than 255 bytes) are joined.
+                      Returns empty list if query fails.
         """
         try:
-            answers = dns.resolver.resolve(domain, 'TXT')
+            answers = _RESOLVER.resolve(domain, 'TXT')
             result = []
             for r in answers:
                 if r.strings is not None:
-                    s = r.strings[0].decode()
+                    s = b''.join(r.strings).decode()
                     result.append(s)
             return result
-        except Exception:
+        except _DEFINITIVE_DNS_ERRORS:
             return []
 
     def find_spf(self, records):
         """
         Find and extract SPF (Sender Policy Framework) record from TXT records.
 
-        Searches through TXT records to find the one containing SPF policy.
+        Searches through TXT records to find the one declaring an SPF policy.
 
         Parameters:
-            records (list[list[bytes]]): List of TXT record string lists from get_txt_records().
+            records (list[str]): List of decoded TXT records from get_txt_records().
 
         Returns:
-            str or None: The SPF record as a decoded string, or None if no SPF record found.
+            str or None: The SPF record, or None if no SPF record found.
         """
-        for record_set in records:
-            if 'v=spf1' in record_set:
-                return record_set
+        for record in records:
+            if record.startswith('v=spf1'):
+                return record
         return None
 
-    def run_dns_analysis(self, email_domain, website_domain=None):
+    def run_dns_analysis(self, email_domain, website_domain=None, concurrent=True):
         """
         Perform comprehensive DNS analysis on email and optionally website domains.
 
-        Gathers all DNS record types for the specified domains.
+        Gathers all DNS record types for the specified domains. By default all record lookups
+        for both domains are issued concurrently.
 
         Parameters:
             email_domain (str): The domain from the email address to analyze.
             website_domain (str, optional): The website domain to analyze. If None,
                                           only email_domain is analyzed.
+            concurrent (bool, optional): Whether to run the lookups in a thread pool. Callers
+                                        that already run several analyses in parallel should
+                                        pass False, so the lookups run in the calling thread.
 
         Returns:
             dict: DNS analysis results containing:
@@ -220,30 +321,39 @@ class DNSAnalyzer:
         if not website_domain:
             website_domain = email_domain
 
-        results["email_domain"] = {
-            "domain": email_domain,
-            "mx_records": self.get_mx_records(email_domain),
-            "ns_records": self.get_ns_records(email_domain),
-            "a_records": self.get_a_records(email_domain),
-            "aaaa_records": self.get_aaaa_records(email_domain),
-            "cname_record": self.get_cname_record(email_domain),
-            "soa_email": self.get_soa_email(email_domain),
-            "txt_records": self.get_txt_records(email_domain)
+        domains = {"email_domain": email_domain}
+        if website_domain != email_domain:
+            domains["website_domain"] = website_domain
+
+        lookups = {
+            "mx_records": self.get_mx_records,
+            "ns_records": self.get_ns_records,
+            "a_records": self.get_a_records,
+            "aaaa_records": self.get_aaaa_records,
+            "cname_record": self.get_cname_record,
+            "soa_email": self.get_soa_email,
+            "txt_records": self.get_txt_records
         }
-        results["email_domain"]["spf_record"] = self.find_spf(results["email_domain"]["txt_records"])
 
-        if website_domain != email_domain:
-            results["website_domain"] = {
-                "domain": website_domain,
-                "mx_records": self.get_mx_records(website_domain),
-                "ns_records": self.get_ns_records(website_domain),
-                "a_records": self.get_a_records(website_domain),
-                "aaaa_records": self.get_aaaa_records(website_domain),
-                "cname_record": self.get_cname_record(website_domain),
-                "soa_email": self.get_soa_email(website_domain),
-                "txt_records": self.get_txt_records(website_domain)
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=len(lookups) * len(domains)) as executor:
+                futures = {
+                    key: {record: executor.submit(lookup, domain) for record, lookup in lookups.items()}
+                    for key, domain in domains.items()
+                }
+            records = {
+                key: {record: future.result() for record, future in record_futures.items()}
+                for key, record_futures in futures.items()
+            }
+        else:
+            records = {
+                key: {record: lookup(domain) for record, lookup in lookups.items()}
+                for key, domain in domains.items()
             }
-            results["website_domain"]["spf_record"] = self.find_spf(results["website_domain"]["txt_records"])
+
+        for key, domain in domains.items():
+            results[key] = {"domain": domain, **records[key]}
+            results[key]["spf_record"] = self.find_spf(results[key]["txt_records"])
 
         return results
 
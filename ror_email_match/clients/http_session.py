@@ -0,0 +1,38 @@
+from requests_cache import CachedSession
+
+"""
+      |   
+  \  ___  /                           _________
+ _  /   \  _    GÉANT                 |  * *  | Co-Funded by
+    | ~ |       Trust & Identity      | *   * | the European
+     \_/        Incubator             |__*_*__| Union
+      =
+"""
+
+# User-Agent sent to the ROR and Crossref APIs
+USER_AGENT = "BonaFide/1.0"
+
+# Name of the on-disk response cache, created in the user's cache directory
+_CACHE_NAME = "bonafide_cache"
+
+# Successful responses are kept for a day
+_CACHE_EXPIRE_AFTER = 86400
+
+
+def create_cached_session():
+    """
+    Create an HTTP session that caches successful API responses on disk.
+
+    The SQLite cache lives in the user's cache directory (e.g. ~/.cache on Linux),
+    so it is shared between runs regardless of the working directory.
+
+    Parameters:
+        None
+
+    Returns:
+        CachedSession: A new session using the shared response cache.
+    """
+    session = CachedSession(_CACHE_NAME, backend='sqlite', use_cache_dir=True,
+                            expire_after=_CACHE_EXPIRE_AFTER, allowable_codes=(200,))
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
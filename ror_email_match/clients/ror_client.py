@@ -1,5 +1,13 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
 import requests
-import tldextract
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from ror_email_match.clients.dns_client import extract_domain
+from ror_email_match.clients.http_session import create_cached_session
 
 """
       |   
@@ -10,17 +18,49 @@ import tldextract
       =
 """
 
+log = logging.getLogger(__name__)
+
 
 class RORClient:
     """
     A client for interacting with the Research Organization Registry (ROR) API.
     """
 
+    # Country-code TLDs that trigger a country-specific query, shared by all instances
+    TLDS = frozenset({
+        "ac", "ad", "ae", "af", "ag", "ai", "al", "am", "ao", "ar", "as", "at", "au", "aw", "ax", "az",
+        "ba", "bb", "bd", "be", "bf", "bg", "bh", "bi", "bj", "bm", "bn", "bo", "br", "bs", "bt", "bv",
+        "bw", "by", "bz", "ca", "cc", "cd", "cf", "cg", "ch", "ci", "ck", "cl", "cm", "cn", "co", "cr",
+        "cu", "cv", "cw", "cx", "cy", "cz", "de", "dj", "dk", "dm", "do", "dz", "ec", "ee", "eg", "er",
+        "es", "et", "eu", "fi", "fj", "fk", "fm", "fo", "fr", "ga", "gb", "gd", "ge", "gf", "gg", "gh",
+        "gi", "gl", "gm", "gn", "gp", "gq", "gr", "gs", "gt", "gu", "gw", "gy", "hk", "hm", "hn", "hr",
+        "ht", "hu", "id", "ie", "il", "im", "in", "io", "iq", "ir", "is", "it", "je", "jm", "jo", "jp",
+        "ke", "kg", "kh", "ki", "km", "kn", "kp", "kr", "kw", "ky", "kz", "la", "lb", "lc", "li", "lk",
+        "lr", "ls", "lt", "lu", "lv", "ly", "ma", "mc", "md", "me", "mg", "mh", "mk", "ml", "mm", "mn",
+        "mo", "mp", "mq", "mr", "ms", "mt", "mu", "mv", "mw", "mx", "my", "mz", "na", "nc", "ne", "nf",
+        "ng", "ni", "nl", "no", "np", "nr", "nu", "nz", "om", "pa", "pe", "pf", "pg", "ph", "pk", "pl",
+        "pm", "pn", "pr", "ps", "pt", "pw", "py", "qa", "re", "ro", "rs", "ru", "rw", "sa", "sb", "sc",
+        "sd", "se", "sg", "sh", "si", "sj", "sk", "sl", "sm", "sn", "so", "sr", "st", "su", "sv", "sx",
+        "sy", "sz", "tc", "td", "tf", "tg", "th", "tj", "tk", "tl", "tm", "tn", "to", "tr", "tt", "tv",
+        "tw", "tz", "ua", "ug", "uk", "us", "uy", "uz", "va", "vc", "ve", "vg", "vi", "vn", "vu", "wf",
+        "ws", "ye", "yt", "za", "zm", "zw"
+    })
+
+    # Country-code TLDs whose ISO 3166 code, used by GeoNames, differs from the TLD
+    TLD_COUNTRY_CODES = {"uk": "gb"}
+
+    # ROR v2 advanced query prefixes, completed with a URL-encoded domain variant
+    QUERY_PREFIX = "https://api.ror.org/v2/organizations?query.advanced=links.type:website%20AND%20links.value:"
+    COUNTRY_QUERY_PREFIX = ("https://api.ror.org/v2/organizations?query.advanced="
+                            "locations.geonames_details.country_code:{country_code}%20AND%20"
+                            "links.type:website%20AND%20links.value:")
+
     def __init__(self):
         """
-        Initialize the RORClient with a comprehensive list of top-level domains.
+        Initialize the RORClient.
 
-        Creates a set of valid TLDs for country-specific query generation.
+        Creates a pooled HTTP session, retrying transient failures with backoff, that is shared
+        by all ROR queries. Successful responses are cached on disk for a day.
 
         Parameters:
             None
@@ -28,24 +68,12 @@ class RORClient:
         Returns:
             None
         """
-        self.tlds = {
-            "ac", "ad", "ae", "af", "ag", "ai", "al", "am", "ao", "ar", "as", "at", "au", "aw", "ax", "az",
-            "ba", "bb", "bd", "be", "bf", "bg", "bh", "bi", "bj", "bm", "bn", "bo", "br", "bs", "bt", "bv",
-            "bw", "by", "bz", "ca", "cc", "cd", "cf", "cg", "ch", "ci", "ck", "cl", "cm", "cn", "co", "cr",
-            "cu", "cv", "cw", "cx", "cy", "cz", "de", "dj", "dk", "dm", "do", "dz", "ec", "ee", "eg", "er",
-            "es", "et", "eu", "fi", "fj", "fk", "fm", "fo", "fr", "ga", "gb", "gd", "ge", "gf", "gg", "gh",
-            "gi", "gl", "gm", "gn", "gp", "gq", "gr", "gs", "gt", "gu", "gw", "gy", "hk", "hm", "hn", "hr",
-            "ht", "hu", "id", "ie", "il", "im", "in", "io", "iq", "ir", "is", "it", "je", "jm", "jo", "jp",
-            "ke", "kg", "kh", "ki", "km", "kn", "kp", "kr", "kw", "ky", "kz", "la", "lb", "lc", "li", "lk",
-            "lr", "ls", "lt", "lu", "lv", "ly", "ma", "mc", "md", "me", "mg", "mh", "mk", "ml", "mm", "mn",
-            "mo", "mp", "mq", "mr", "ms", "mt", "mu", "mv", "mw", "mx", "my", "mz", "na", "nc", "ne", "nf",
-            "ng", "ni", "nl", "no", "np", "nr", "nu", "nz", "om", "pa", "pe", "pf", "pg", "ph", "pk", "pl",
-            "pm", "pn", "pr", "ps", "pt", "pw", "py", "qa", "re", "ro", "rs", "ru", "rw", "sa", "sb", "sc",
-            "sd", "se", "sg", "sh", "si", "sj", "sk", "sl", "sm", "sn", "so", "sr", "st", "su", "sv", "sx",
-            "sy", "sz", "tc", "td", "tf", "tg", "th", "tj", "tk", "tl", "tm", "tn", "to", "tr", "tt", "tv",
-            "tw", "tz", "ua", "ug", "uk", "us", "uy", "uz", "va", "vc", "ve", "vg", "vi", "vn", "vu", "wf",
-            "ws", "ye", "yt", "za", "zm", "zw"
-        }
+        self.max_workers = 8
+        self.session = create_cached_session()
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504),
+                        respect_retry_after_header=True)
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries))
+        self.session.headers.update({"Accept": "application/json"})
 
     def generate_ror_queries(self, email):
         """
@@ -61,58 +89,135 @@ class RORClient:
             list[str]: List of ROR API query URLs targeting different domain variants.
                       Includes country-specific queries when applicable TLD is detected.
         """
-        extracted = tldextract.extract(email.split('@')[-1])
+        extracted = extract_domain(email.rsplit('@', 1)[-1].lower())
 
-        parts = extracted.subdomain.split('.') + [extracted.domain] if extracted.subdomain else [extracted.domain]
+        if extracted.subdomain:
+            parts = [*extracted.subdomain.split('.'), extracted.domain]
+        else:
+            parts = [extracted.domain]
 
         suffix = extracted.suffix
 
+        # Multi-label suffixes such as "ac.uk" are resolved by tldextract; the country is the last label
+        country_tld = suffix.rpartition('.')[2]
+
         queries = []
-        if suffix.split('.')[-1] in self.tlds:
-            base_query = f"https://api.ror.org/v2/organizations?query.advanced=locations.geonames_details.country_code:{suffix.upper()}%20AND%20links.type:website%20AND%20links.value:"
+        if country_tld in self.TLDS:
+            country_code = self.TLD_COUNTRY_CODES.get(country_tld, country_tld).upper()
+            base_query = self.COUNTRY_QUERY_PREFIX.format(country_code=country_code)
         else:
-            base_query = f"https://api.ror.org/v2/organizations?query.advanced=links.type:website%20AND%20links.value:"
+            base_query = self.QUERY_PREFIX
+
+        # Generate all possible domain variants, including intermediate subdomains,
+        # by extending the trailing variants one label at a time from the right.
+        # Variants are bucketed by label count, so queries go from less to more specific.
+        seen_variants = set()
+        variants_by_depth = [[] for _ in range(len(parts) + 1)]
+        domain_variant = ""
+        subdomain_variant = ""
+        for i in range(len(parts) - 1, -1, -1):
+            domain_variant = f"{parts[i]}.{domain_variant}" if domain_variant else parts[i]
+            variants = [(domain_variant, len(parts) - i)]
 
-        # Generate all possible domain variants, including intermediate subdomains
-        domain_variants = set()
-        for i in range(len(parts)):
-            domain_variants.add(".".join(parts[i:]))
             if i < len(parts) - 1:
-                domain_variants.add(".".join(parts[i:-1]))
+                subdomain_variant = f"{parts[i]}.{subdomain_variant}" if subdomain_variant else parts[i]
+                variants.append((subdomain_variant, len(parts) - 1 - i))
+
+            variants.append((parts[i], 1))
 
-        domain_variants.update(parts)
+            for variant, depth in variants:
+                if variant not in seen_variants:
+                    seen_variants.add(variant)
+                    variants_by_depth[depth].append(variant)
 
-        for variant in sorted(domain_variants, key=lambda x: x.count('.')):
-            queries.append(base_query + variant)
+        for variants in variants_by_depth:
+            for variant in variants:
+                queries.append(base_query + quote(variant, safe=''))
 
         return queries
 
-    def fetch_ror_data(self, queries):
+    def fetch_ror_data(self, queries, email_domain=None):
         """
         Execute multiple ROR API queries and aggregate results.
 
-        Makes HTTP requests to each provided query URL and combines all organization
-        results into a single list.
+        Queries are dispatched concurrently over a shared HTTP session, and all organization
+        results are combined into a single list in the order of the provided queries.
+
+        When email_domain is given, the most specific (last) query is executed first. If it
+        returns an organization whose domains or website exactly match the email domain,
+        the less specific queries are skipped.
 
         Parameters:
-            queries (list[str]): List of ROR API query URLs to execute.
+            queries (list[str]): List of ROR API query URLs to execute, ordered from
+                                less to more specific.
+            email_domain (str, optional): The email domain used to short-circuit the fan-out.
 
         Returns:
             list[dict]: Aggregated list of organization data dictionaries from ROR API.
                        Each dictionary contains organization metadata like name, links,
                        and external identifiers.
         """
+        specific_results = []
+        if email_domain and queries:
+            specific_results = self._fetch_query(queries[-1])
+            if any(self._matches_domain(item, email_domain) for item in specific_results):
+                return specific_results
+            queries = queries[:-1]
+
         results = []
-        for query in queries:
-            try:
-                response = requests.get(query)
-                if response.status_code == 200:
-                    data = response.json()
-                    results.extend(data.get("items", []))
-            except requests.RequestException as e:
-                print(f"Error fetching data from {query}: {e}")
+        if len(queries) <= 1:
+            for query in queries:
+                results.extend(self._fetch_query(query))
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(queries))) as executor:
+                for items in executor.map(self._fetch_query, queries):
+                    results.extend(items)
+
+        results.extend(specific_results)
         return results
 
+    @staticmethod
+    def _matches_domain(item, domain):
+        """
+        Check whether a ROR organization is registered under exactly the given domain.
+
+        Parameters:
+            item (dict): Organization data dictionary from the ROR API.
+            domain (str): The domain to look for.
+
+        Returns:
+            bool: True if the domain is one of the organization's domains or the host
+                 of one of its websites (ignoring a leading 'www.').
+        """
+        domain = domain.lower()
+        if domain in (item.get("domains") or []):
+            return True
+
+        for link in item.get("links") or []:
+            if link.get("type") == "website" and extract_domain(link.get("value", "")).fqdn.removeprefix('www.') == domain:
+                return True
+        return False
+
+    def _fetch_query(self, query):
+        """
+        Execute a single ROR API query.
+
+        Parameters:
+            query (str): ROR API query URL to execute.
+
+        Returns:
+            list[dict]: Organization data dictionaries returned by the query.
+                       Returns empty list if the request fails.
+        """
+        try:
+            response = self.session.get(query, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("items", [])
+        except requests.RequestException as e:
+            log.warning("ROR fetch failed for %s: %s", query, e)
+        return []
+
     def aggregate_links(self, results):
         """
         Aggregate links from the results into the v1 API structure.
@@ -124,14 +229,24 @@ class RORClient:
               dict: Results from ROR API with aggregated links into the v1 ROR API structure.
         """
         for result in results:
-            links = []
-            if result["links"] is not None:
-                for link in result["links"]:
-                    if link["type"] == "website":
-                        links.append(link["value"])
-            if result["domains"] is not None:
-                for link in result["domains"]:
-                    links.append(link)
-            result["links"] = links
+            self.flatten_links(result)
 
         return results
+
+    @staticmethod
+    def flatten_links(result):
+        """
+        Aggregate the links of a single result into the v1 API structure.
+
+        Parameters:
+              result (dict): Organization result from ROR API.
+
+        Returns:
+              dict: The same result, with 'links' replaced by a list of its website URLs
+                    followed by its domains.
+        """
+        links = [link["value"] for link in (result.get("links") or []) if link["type"] == "website"]
+        links.extend(result.get("domains") or [])
+        result["links"] = links
+
+        return result
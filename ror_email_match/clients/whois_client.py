@@ -1,3 +1,5 @@
+import functools
+
 import whois
 
 
@@ -6,6 +8,7 @@ class WHOISClient:
         pass
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def query_domain(domain):
         if not domain:
             print("No domain provided.")
@@ -26,6 +29,7 @@ class WHOISClient:
         return relevant_fields
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def compare_domains(domain1, domain2):
         if not domain1 or not domain2:
             print("No domain provided.")
@@ -61,13 +65,20 @@ class WHOISClient:
             results['address'] = domain1_results['address']
             match_score += 50
 
-        if domain1_results['emails'] is not None and domain2_results['emails'] is not None:
-            for email1 in domain1_results['emails']:
-                for email2 in domain2_results['emails']:
-                    if email1 == email2:
-                        if 'emails' not in results:
-                            results['emails'] = []
-                        results['emails'].append(email1)
+        domain1_emails = WHOISClient._as_email_set(domain1_results['emails'])
+        domain2_emails = WHOISClient._as_email_set(domain2_results['emails'])
+        common_emails = domain1_emails & domain2_emails
+        if common_emails:
+            results['emails'] = sorted(common_emails)
             match_score += 80
 
         return min(match_score, 100), results
+
+    @staticmethod
+    def _as_email_set(emails):
+        # python-whois returns a single string when a record lists one email and a list otherwise
+        if not emails:
+            return set()
+        if isinstance(emails, str):
+            return {emails}
+        return set(emails)
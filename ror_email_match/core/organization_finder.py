@@ -1,10 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from operator import attrgetter
 from typing import Any
 
 from ror_email_match.clients.dns_client import DNSAnalyzer
 from ror_email_match.clients.ror_client import RORClient
 from ror_email_match.clients.crossref_client import CrossrefClient
 from ror_email_match.clients.whois_client import WHOISClient
-from ror_email_match.scoring.match_scorer import MatchScorer
+from ror_email_match.scoring.match_scorer import MatchScorer, ScoreBreakdown
 from ror_email_match.output.output_formatter import OutputFormatter
 
 import json
@@ -19,6 +23,31 @@ import json
 """
 
 
+@dataclass(slots=True)
+class ScoredResult:
+    """
+    A ROR organization together with its match score and the lookups used to compute it.
+
+    Attributes:
+        total (int): Overall match score, used for ranking.
+        result (dict): The ROR organization record.
+        score_breakdown (ScoreBreakdown): Per-criterion scores from MatchScorer.
+        dns_results (dict): DNS analysis for the email domain and the organization's website.
+        whois_results (dict or None): WHOIS comparison, or None if no comparison was made.
+        links (list[str]): The organization's flattened website links.
+        website_domain (str or None): Domain of the first link, or None if there are no links.
+        crossref_id (str): The organization's FundRef ID, or 'N/A' if it has none.
+    """
+    total: int
+    result: dict
+    score_breakdown: ScoreBreakdown
+    dns_results: dict
+    whois_results: dict | None
+    links: list[str]
+    website_domain: str | None
+    crossref_id: str
+
+
 class OrganizationFinder:
     """
     Main orchestrator class for finding organizations associated with email addresses.
@@ -46,6 +75,7 @@ class OrganizationFinder:
         self.whois_client = WHOISClient()
         self.match_scorer = MatchScorer()
         self.output_formatter = OutputFormatter()
+        self.max_workers = 16
 
     def find_org_associated_with_email(self, email: str, result_display_limit: int = None) -> dict[str, Any]:
         """
@@ -64,7 +94,8 @@ class OrganizationFinder:
                                                  If None or negative, displays all results.
 
         Returns:
-            dict: Results in dict format. Results are also printed to console via OutputFormatter.
+            dict: Results in dict format, with the ranked ScoredResult list under "ror_scored_results".
+                  Results are also printed to console via OutputFormatter.
         """
         # Extract domain from email for DNS analysis
         email_domain = self.dns_analyzer.get_domain_from_email(email)
@@ -79,7 +110,7 @@ class OrganizationFinder:
         for query in queries:
             print(f"  {query}")
 
-        results = self.ror_client.fetch_ror_data(queries)
+        results = self.ror_client.fetch_ror_data(queries, email_domain)
 
         if not results:
             print("\nNo ROR results found")
@@ -88,32 +119,40 @@ class OrganizationFinder:
 
         print(f"\nFound {len(results)} potential organization matches")
 
-        results = self.ror_client.aggregate_links(results)
-
-        # Score and sort results
-        scored_results = []
+        # Flatten each result's links and find its website domain in a single pass
+        website_domains = []
         for result in results:
-            dns_results_for_result = initial_dns_results.copy()
-            whois_results_for_result = None
-
-            if result.get('links'):
-                website_domain = self.dns_analyzer.get_domain_from_url(result['links'][0])
-                if website_domain != email_domain:
-                    dns_results_for_result = self.dns_analyzer.run_dns_analysis(email_domain, website_domain)
-
-                    # Perform WHOIS comparison between email domain and website domain
-                    whois_match_score, whois_matches = self.whois_client.compare_domains(email_domain, website_domain)
-                    whois_results_for_result = {
-                        "match_score": whois_match_score,
-                        "matches": whois_matches
-                    }
-
-            scored_results.append(
-                (result, self.match_scorer.calculate_match_score(email, result, dns_results_for_result,
-                                                                 whois_results_for_result),
-                 dns_results_for_result, whois_results_for_result))
+            self.ror_client.flatten_links(result)
+            website_domains.append(
+                self.dns_analyzer.get_domain_from_url(result['links'][0]) if result['links'] else None)
+
+        # Cache the email domain's WHOIS record before the concurrent comparisons
+        if any(website_domain and website_domain != email_domain for website_domain in website_domains):
+            self.whois_client.query_domain(email_domain)
+
+        # Run the DNS and WHOIS lookups concurrently, once per distinct website domain
+        unique_website_domains = list(dict.fromkeys(website_domains))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            enrichments_by_domain = dict(zip(unique_website_domains,
+                                             executor.map(self._enrich_result, unique_website_domains,
+                                                          repeat(email_domain), repeat(initial_dns_results))))
+
+        # Score all results in one batch
+        enrichments = [enrichments_by_domain[website_domain] for website_domain in website_domains]
+        dns_results = [dns_results_for_result for dns_results_for_result, _ in enrichments]
+        whois_results = [whois_results_for_result for _, whois_results_for_result in enrichments]
+        score_breakdowns = self.match_scorer.calculate_match_scores(email, results, dns_results, whois_results)
+
+        # Sort results by score
+        scored_results = []
+        for result, website_domain, score_breakdown, dns_results_for_result, whois_results_for_result in zip(
+                results, website_domains, score_breakdowns, dns_results, whois_results):
+            scored_results.append(ScoredResult(score_breakdown.total, result, score_breakdown,
+                                               dns_results_for_result, whois_results_for_result,
+                                               result['links'], website_domain,
+                                               self.match_scorer.get_crossref_id(result)))
 
-        scored_results.sort(key=lambda x: x[1]["total"], reverse=True)
+        scored_results.sort(key=attrgetter('total'), reverse=True)
 
         if not result_display_limit or result_display_limit < 0:
             result_display_limit = len(scored_results)
@@ -126,4 +165,37 @@ class OrganizationFinder:
             self.dns_analyzer, self.crossref_client
         )
 
-        return {"ror_scored_results": scored_results}
\ No newline at end of file
+        return {"ror_scored_results": scored_results}
+
+    def _enrich_result(self, website_domain, email_domain, initial_dns_results):
+        """
+        Gather DNS and WHOIS data comparing the email domain with an organization's website.
+
+        Parameters:
+            website_domain (str or None): Domain of the organization's first link, or None
+                                         if the organization has no links.
+            email_domain (str): The domain of the email address being analyzed.
+            initial_dns_results (dict): DNS analysis results for the email domain only.
+
+        Returns:
+            tuple: (dns_results, whois_results) where dns_results is the DNS analysis for
+                   the email and website domains (or a copy of initial_dns_results when the
+                   result has no distinct website), and whois_results is a dict with
+                   match_score and matches, or None if no comparison was made.
+        """
+        dns_results_for_result = initial_dns_results.copy()
+        whois_results_for_result = None
+
+        if website_domain and website_domain != email_domain:
+            # Run the lookups in this worker thread
+            dns_results_for_result = self.dns_analyzer.run_dns_analysis(email_domain, website_domain,
+                                                                        concurrent=False)
+
+            # Perform WHOIS comparison between email domain and website domain
+            whois_match_score, whois_matches = self.whois_client.compare_domains(email_domain, website_domain)
+            whois_results_for_result = {
+                "match_score": whois_match_score,
+                "matches": whois_matches
+            }
+
+        return dns_results_for_result, whois_results_for_result
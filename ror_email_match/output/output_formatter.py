@@ -1,3 +1,5 @@
+import sys
+
 """
       |
   \  ___  /                           _________
@@ -7,6 +9,11 @@
       =
 """
 
+# Section separators
+_SEP_EQ80 = "=" * 80
+_SEP_DASH80 = "-" * 80
+_SEP_DASH60 = "-" * 60
+
 
 class OutputFormatter:
     """
@@ -30,77 +37,91 @@ class OutputFormatter:
 
     def print_dns_comparison(self, similarities, email_domain, website_domain):
         """Print DNS comparison results in a formatted way"""
+        print("\n".join(self._format_dns_comparison(similarities, email_domain, website_domain)))
+
+    def _format_dns_comparison(self, similarities, email_domain, website_domain):
+        """Format DNS comparison results as a list of output lines"""
+        lines = []
         if not similarities:
-            print(f"\n   DNS Comparison")
-            print(f"   No comparison available (same domain: {email_domain})")
-            return
+            lines.append(f"\n   DNS Comparison")
+            lines.append(f"   No comparison available (same domain: {email_domain})")
+            return lines
 
-        print(f"\n   DNS Comparison: {email_domain} and {website_domain}")
-        print("   " + "-" * 60)
+        lines.append(f"\n   DNS Comparison: {email_domain} and {website_domain}")
+        lines.append("   " + _SEP_DASH60)
 
         score = similarities["relation_score"]
-        print(f"\n       Domain Relationship Score: {score}/100")
+        lines.append(f"\n       Domain Relationship Score: {score}/100")
 
         if similarities["matching_nameservers"]:
-            print(f"\n       Matching Name Servers:")
+            lines.append(f"\n       Matching Name Servers:")
             for ns in similarities["matching_nameservers"]:
-                print(f"       - {ns}")
+                lines.append(f"       - {ns}")
 
         if similarities["matching_a_records"]:
-            print(f"\n       Matching A Records (IPs):")
+            lines.append(f"\n       Matching A Records (IPs):")
             for ip in similarities["matching_a_records"]:
-                print(f"       - {ip}")
+                lines.append(f"       - {ip}")
 
         if similarities["matching_mx_records"]:
-            print(f"\n       Matching MX Records:")
+            lines.append(f"\n       Matching MX Records:")
             for mx in similarities["matching_mx_records"]:
-                print(f"       - {mx}")
+                lines.append(f"       - {mx}")
 
         if similarities['soa_email_relation']:
-            print(f"\n       Related SOA emails found")
-            print(f"              Email SOA: {similarities["email_soa"]}")
-            print(f"              Website SOA: {similarities["website_soa"]}")
+            lines.append(f"\n       Related SOA emails found")
+            lines.append(f"              Email SOA: {similarities["email_soa"]}")
+            lines.append(f"              Website SOA: {similarities["website_soa"]}")
 
         if similarities['spf_similarity']:
-            print(f"\n       Related SPF configurations found")
-            print(f"              Email SPF: {similarities["email_spf"]}")
-            print(f"              Website SPF: {similarities["website_spf"]}")
+            lines.append(f"\n       Related SPF configurations found")
+            lines.append(f"              Email SPF: {similarities["email_spf"]}")
+            lines.append(f"              Website SPF: {similarities["website_spf"]}")
+
+        return lines
 
     def print_whois_comparison(self, whois_results, email_domain, website_domain):
         """Print WHOIS comparison results in a formatted way"""
+        print("\n".join(self._format_whois_comparison(whois_results, email_domain, website_domain)))
+
+    def _format_whois_comparison(self, whois_results, email_domain, website_domain):
+        """Format WHOIS comparison results as a list of output lines"""
+        lines = []
         if not whois_results:
-            print(f"\n   WHOIS Comparison")
-            print(f"   No comparison available (same domain: {email_domain})")
-            return
+            lines.append(f"\n   WHOIS Comparison")
+            lines.append(f"   No comparison available (same domain: {email_domain})")
+            return lines
 
-        print(f"\n   WHOIS Comparison: {email_domain} and {website_domain}")
-        print("   " + "-" * 60)
+        lines.append(f"\n   WHOIS Comparison: {email_domain} and {website_domain}")
+        lines.append("   " + _SEP_DASH60)
 
         match_score = whois_results.get("match_score", 0)
         matches = whois_results.get("matches", {})
 
-        print(f"\n       WHOIS Match Score: {match_score}/100")
+        lines.append(f"\n       WHOIS Match Score: {match_score}/100")
 
         if matches.get("domain_name"):
-            print(f"\n       Matching Domain Name:")
-            print(f"       - {matches['domain_name']}")
+            lines.append(f"\n       Matching Domain Name:")
+            lines.append(f"       - {matches['domain_name']}")
 
         if matches.get("org"):
-            print(f"\n       Matching Organization:")
-            print(f"       - {matches['org']}")
+            lines.append(f"\n       Matching Organization:")
+            lines.append(f"       - {matches['org']}")
 
         if matches.get("name"):
-            print(f"\n       Matching Registrant Name:")
-            print(f"       - {matches['name']}")
+            lines.append(f"\n       Matching Registrant Name:")
+            lines.append(f"       - {matches['name']}")
 
         if matches.get("address"):
-            print(f"\n       Matching Address:")
-            print(f"       - {matches['address']}")
+            lines.append(f"\n       Matching Address:")
+            lines.append(f"       - {matches['address']}")
 
         if matches.get("emails"):
-            print(f"\n       Matching Emails:")
+            lines.append(f"\n       Matching Emails:")
             for email in matches['emails']:
-                print(f"       - {email}")
+                lines.append(f"       - {email}")
+
+        return lines
 
     def print_individual_dns_analysis(self, dns_results, email_domain, dns_analyzer):
         """
@@ -118,13 +139,16 @@ class OutputFormatter:
         Returns:
             None
         """
+        print("\n".join(self._format_individual_dns_analysis(dns_results, email_domain, dns_analyzer)))
+
+    def _format_individual_dns_analysis(self, dns_results, email_domain, dns_analyzer):
+        """Format DNS analysis results for an individual match as a list of output lines"""
         if "website_domain" in dns_results:
             website_domain = dns_results["website_domain"]["domain"]
 
             similarities = dns_analyzer.compare_dns_results(dns_results)
-            self.print_dns_comparison(similarities, email_domain, website_domain)
-        else:
-            self.print_dns_comparison(None, email_domain, email_domain)
+            return self._format_dns_comparison(similarities, email_domain, website_domain)
+        return self._format_dns_comparison(None, email_domain, email_domain)
 
     def print_individual_whois_analysis(self, whois_results, email_domain, website_domain):
         """
@@ -141,10 +165,13 @@ class OutputFormatter:
         Returns:
             None
         """
+        print("\n".join(self._format_individual_whois_analysis(whois_results, email_domain, website_domain)))
+
+    def _format_individual_whois_analysis(self, whois_results, email_domain, website_domain):
+        """Format WHOIS analysis results for an individual match as a list of output lines"""
         if whois_results and email_domain != website_domain:
-            self.print_whois_comparison(whois_results, email_domain, website_domain)
-        else:
-            self.print_whois_comparison(None, email_domain, email_domain)
+            return self._format_whois_comparison(whois_results, email_domain, website_domain)
+        return self._format_whois_comparison(None, email_domain, email_domain)
 
     def print_dns_analysis(self, results, dns_analyzer):
         """
@@ -164,69 +191,72 @@ class OutputFormatter:
     def print_organization_results(self, scored_results, result_display_limit, email_domain, dns_analyzer,
                                    crossref_client):
         """Print formatted organization results"""
-        print("\nOrganization Matches:")
-        print("=" * 80)
+        displayed_results = scored_results[:result_display_limit]
 
-        for i, (result, score_breakdown, dns_results_for_result, whois_results_for_result) in enumerate(scored_results, start=1):
-            if i > result_display_limit:
-                break
+        # Fetch Crossref metadata for all displayed results up front
+        crossref_data_by_id = crossref_client.fetch_crossref_data_batch(
+            [scored_result.crossref_id for scored_result in displayed_results])
 
-            external_ids = result.get('external_ids', {})
-            crossref_id = 'N/A'
-            for external_id in external_ids:
-                if external_id["type"] == "fundref":
-                    crossref_id = external_id["all"][0]
-            crossref_data = crossref_client.fetch_crossref_data(crossref_id) if crossref_id != 'N/A' else None
+        out = ["\nOrganization Matches:", _SEP_EQ80]
+
+        for i, scored_result in enumerate(displayed_results, start=1):
+            result = scored_result.result
+            score_breakdown = scored_result.score_breakdown
+            crossref_data = crossref_data_by_id.get(scored_result.crossref_id)
 
             if result.get('names') is not None:
-                print(f"\n{i}. {result.get('names')[0]['value']}")
+                out.append(f"\n{i}. {result.get('names')[0]['value']}")
             else:
-                print("No name found")
-            print(f"   Match Score: {score_breakdown['total']}%")
-            print(f"   Website(s): {', '.join(result.get('links', []))}")
-
-            print("\n   Score Breakdown:")
-            print(
-                f"      Fully Qualified Domain Match        : {score_breakdown['fully_qualified_domain_name_match']:>3}/100 points")
-            print(f"      Base Domain Match                   : {score_breakdown['domain_match']:>3}/80  points")
-
-            if score_breakdown["domain_match"] > 0:
-                print(
-                    f"         Email is Subdomain of Website    : {score_breakdown['email_is_subdomain_of_website_domain']:>3}/10  points")
-                print(
-                    f"         Website is Subdomain of Email    : {score_breakdown['website_is_subdomain_of_email_domain']:>3}/-50 points")
-                print(
-                    f"         Subdomain Mismatch Penalty       : {score_breakdown['subdomain_mismatch']:>3}/-50 points")
+                out.append("No name found")
+            out.append(f"   Match Score: {scored_result.total}%")
+            out.append(f"   Website(s): {', '.join(scored_result.links)}")
+
+            out.append("\n   Score Breakdown:")
+            out.append(
+                f"      Fully Qualified Domain Match        : {score_breakdown.fully_qualified_domain_name_match:>3}/100 points")
+            out.append(f"      Base Domain Match                   : {score_breakdown.domain_match:>3}/80  points")
+
+            if score_breakdown.domain_match > 0:
+                out.append(
+                    f"         Email is Subdomain of Website    : {score_breakdown.email_is_subdomain_of_website_domain:>3}/10  points")
+                out.append(
+                    f"         Website is Subdomain of Email    : {score_breakdown.website_is_subdomain_of_email_domain:>3}/-50 points")
+                out.append(
+                    f"         Subdomain Mismatch Penalty       : {score_breakdown.subdomain_mismatch:>3}/-50 points")
             else:
-                print(
-                    f"      Email in Website Subdomain          : {score_breakdown['domain_of_email_in_website_subdomain']:>3}/20  points")
-                print(
-                    f"      Website in Email Subdomain          : {score_breakdown['domain_of_website_in_email_subdomain']:>3}/20  points")
+                out.append(
+                    f"      Email in Website Subdomain          : {score_breakdown.domain_of_email_in_website_subdomain:>3}/20  points")
+                out.append(
+                    f"      Website in Email Subdomain          : {score_breakdown.domain_of_website_in_email_subdomain:>3}/20  points")
 
-            print(
-                  f"      DNS Bonus                           : {score_breakdown['dns_similarity_bonus']:>3}/30  points")
-            print(f"      WHOIS Bonus                         : {score_breakdown['whois_bonus']:>3}/30  points")
-            print(f"      Crossref Bonus                      : {score_breakdown['crossref_bonus']:>3}/5   points")
+            out.append(
+                  f"      DNS Bonus                           : {score_breakdown.dns_similarity_bonus:>3}/30  points")
+            out.append(f"      WHOIS Bonus                         : {score_breakdown.whois_bonus:>3}/30  points")
+            out.append(f"      Crossref Bonus                      : {score_breakdown.crossref_bonus:>3}/5   points")
 
-            print(f"\n   Crossref ID: {crossref_id}")
+            out.append(f"\n   Crossref ID: {scored_result.crossref_id}")
 
             if crossref_data:
-                print("   Crossref Data:")
-                print(f"      Name        : {crossref_data.get('name', 'N/A')}")
-                print(f"      Location    : {crossref_data.get('location', 'N/A')}")
-                print(f"      Works Count : {crossref_data.get('work-count', 'unknown')}")
+                out.append("   Crossref Data:")
+                out.append(f"      Name        : {crossref_data.get('name', 'N/A')}")
+                out.append(f"      Location    : {crossref_data.get('location', 'N/A')}")
+                out.append(f"      Works Count : {crossref_data.get('work-count', 'unknown')}")
 
                 alt_names = crossref_data.get('alt-names', [])
                 if alt_names:
                     preview = ', '.join(alt_names[:3])
                     suffix = ", ..." if len(alt_names) > 3 else ""
-                    print(f"      Also known as: {preview}{suffix}")
+                    out.append(f"      Also known as: {preview}{suffix}")
+
+            out.extend(self._format_individual_dns_analysis(scored_result.dns_results, email_domain, dns_analyzer))
 
-            self.print_individual_dns_analysis(dns_results_for_result, email_domain, dns_analyzer)
+            # Add WHOIS analysis if available
+            if scored_result.whois_results and scored_result.links:
+                out.extend(self._format_individual_whois_analysis(scored_result.whois_results, email_domain,
+                                                                  scored_result.website_domain))
 
-            # Print WHOIS analysis if available
-            if whois_results_for_result and result.get('links'):
-                website_domain = dns_analyzer.get_domain_from_url(result['links'][0])
-                self.print_individual_whois_analysis(whois_results_for_result, email_domain, website_domain)
+            out.append("\n" + _SEP_DASH80)
 
-            print("\n" + "-" * 80)
\ No newline at end of file
+        # Write the report to stdout
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
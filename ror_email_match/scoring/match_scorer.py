@@ -1,5 +1,6 @@
-import tldextract
-from ror_email_match.clients.dns_client import DNSAnalyzer
+from dataclasses import dataclass
+
+from ror_email_match.clients.dns_client import DNSAnalyzer, extract_domain
 
 """
       |   
@@ -10,6 +11,54 @@ from ror_email_match.clients.dns_client import DNSAnalyzer
       =
 """
 
+# WHOIS and DNS similarity bonus (a third of the 0-100 score, at most 30) indexed by score
+_BONUS_BY_SCORE = bytes(min(30, score // 3) for score in range(101))
+
+
+@dataclass(slots=True)
+class ScoreBreakdown:
+    """
+    Per-criterion scores of a match between an email and an organization result.
+
+    Use dataclasses.asdict() to get the breakdown as a plain dict.
+
+    Attributes:
+        fully_qualified_domain_name_match (int): 0-100 points for exact FQDN match.
+        domain_match (int): 0-80 points for base domain match.
+        website_is_subdomain_of_email_domain (int): 0 to -50 points.
+        email_is_subdomain_of_website_domain (int): 0-10 points.
+        subdomain_mismatch (int): 0 to -50 points for conflicting subdomains.
+        domain_of_email_in_website_subdomain (int): 0-20 points.
+        domain_of_website_in_email_subdomain (int): 0-20 points.
+        crossref_bonus (int): 0-5 points for having Crossref data.
+        dns_verification_bonus (int): 0-10 points for DNS record matches.
+        dns_similarity_bonus (int): 0-30 points based on overall DNS similarity.
+        whois_bonus (int): 0-30 points based on WHOIS data matches.
+        total (int): Sum of all score components, capped at 100.
+    """
+    fully_qualified_domain_name_match: int = 0
+    domain_match: int = 0
+    website_is_subdomain_of_email_domain: int = 0
+    email_is_subdomain_of_website_domain: int = 0
+    subdomain_mismatch: int = 0
+    domain_of_email_in_website_subdomain: int = 0
+    domain_of_website_in_email_subdomain: int = 0
+    crossref_bonus: int = 0
+    dns_verification_bonus: int = 0
+    dns_similarity_bonus: int = 0
+    whois_bonus: int = 0
+    total: int = 0
+
+
+@dataclass(slots=True, frozen=True)
+class _EmailContext:
+    """Email-side inputs of the scoring, computed once per email and shared by every result."""
+    domain: str
+    subdomain: str
+    fqdn: str
+    subdomain_parts: frozenset
+    saturated_scores: dict
+
 
 class MatchScorer:
     """
@@ -49,137 +98,243 @@ class MatchScorer:
                                           If provided, enables WHOIS verification bonuses.
 
         Returns:
-            dict: Score breakdown containing:
-                 - fully_qualified_domain_name_match: 0-100 points for exact FQDN match
-                 - domain_match: 0-80 points for base domain match
-                 - website_is_subdomain_of_email_domain: 0 to -10 points
-                 - email_is_subdomain_of_website_domain: 0-10 points
-                 - subdomain_mismatch: 0 to -10 points for conflicting subdomains
-                 - domain_of_email_in_website_subdomain: 0-20 points
-                 - domain_of_website_in_email_subdomain: 0-20 points
-                 - crossref_bonus: 0-5 points for having Crossref data
-                 - dns_verification_bonus: 0-10 points for DNS record matches
-                 - dns_similarity_bonus: 0-15 points based on overall DNS similarity
-                 - whois_bonus: 0-20 points based on WHOIS data matches
-                 - total: Sum of all score components
+            ScoreBreakdown: Per-criterion scores and their capped total.
+        """
+        return self.calculate_match_scores(email, [result], [dns_results], [whois_results])[0]
+
+    def calculate_match_scores(self, email, results, dns_results=None, whois_results=None):
+        """
+        Calculate match scores between an email and several organization results.
+
+        The email-side work (domain extraction, subdomain labels, score bounds) is done once
+        and shared by every result.
+
+        Parameters:
+            email (str): The email address to match against.
+            results (list[dict]): Organization results from ROR API.
+            dns_results (list[dict], optional): DNS analysis results for each result, in the same
+                                               order as results. Entries may be None.
+            whois_results (list[dict], optional): WHOIS comparison results for each result, in the
+                                                 same order as results. Entries may be None.
+
+        Raises:
+            ValueError: If dns_results or whois_results is not the same length as results.
+
+        Returns:
+            list[ScoreBreakdown]: Score breakdown for each result, in the same order as results.
+        """
+        email_context = self._email_context(email)
+        if dns_results is None:
+            dns_results = [None] * len(results)
+        if whois_results is None:
+            whois_results = [None] * len(results)
+
+        return [self._score_result(email_context, result, result_dns_results, result_whois_results)
+                for result, result_dns_results, result_whois_results in zip(results, dns_results, whois_results,
+                                                                            strict=True)]
+
+    @staticmethod
+    def _email_context(email):
         """
-        score_breakdown = {
-            "fully_qualified_domain_name_match": 0,
-            "domain_match": 0,
-            "website_is_subdomain_of_email_domain": 0,
-            "email_is_subdomain_of_website_domain": 0,
-            "subdomain_mismatch": 0,
-            "domain_of_email_in_website_subdomain": 0,
-            "domain_of_website_in_email_subdomain": 0,
-            "crossref_bonus": 0,
-            "dns_verification_bonus": 0,
-            "dns_similarity_bonus": 0,
-            "whois_bonus": 0,
-            "total": 0
-        }
+        Extract the parts of an email address that every result is scored against.
 
+        Parameters:
+            email (str): The email address to match against.
+
+        Returns:
+            _EmailContext: The email's domain parts and the score bounds of the domain match check.
+        """
         email_full_domain = email.split('@')[-1]
-        email_parts = tldextract.extract(email_full_domain)
+        email_parts = extract_domain(email_full_domain)
+        email_subdomain = email_parts.subdomain
+
+        # Bounds of the scores the domain match check can still change
+        if email_subdomain:
+            saturated_scores = {
+                "domain_match": 80,
+                "subdomain_mismatch": -50,
+                "email_is_subdomain_of_website_domain": 10,
+                "domain_of_website_in_email_subdomain": 20,
+                "domain_of_email_in_website_subdomain": 20
+            }
+        else:
+            saturated_scores = {
+                "domain_match": 80,
+                "website_is_subdomain_of_email_domain": -50
+            }
+
+        return _EmailContext(
+            domain=email_parts.domain,
+            subdomain=email_subdomain,
+            fqdn=email_parts.fqdn,
+            subdomain_parts=frozenset(email_subdomain.split('.')) if email_subdomain else frozenset(),
+            saturated_scores=saturated_scores
+        )
+
+    def _score_result(self, email_context, result, dns_results, whois_results):
+        """
+        Score a single organization result against a prepared email context.
+
+        Parameters:
+            email_context (_EmailContext): Email-side inputs from _email_context().
+            result (dict): Organization result from ROR API.
+            dns_results (dict or None): DNS analysis results for the result.
+            whois_results (dict or None): WHOIS comparison results for the result.
+
+        Returns:
+            ScoreBreakdown: Per-criterion scores and their capped total.
+        """
+        score_breakdown = ScoreBreakdown()
+
+        em_dom, em_sub, em_fqdn = email_context.domain, email_context.subdomain, email_context.fqdn
+        email_subdomain_parts = email_context.subdomain_parts
+        saturated_scores = email_context.saturated_scores
+
+        # Extract every link
+        links = result.get('links', [])
+        result_parts_list = [extract_domain(link) for link in links]
 
         # Add WHOIS verification bonus if applicable
         if whois_results:
             whois_match_score = whois_results.get("match_score", 0)
-            score_breakdown["whois_bonus"] = min(30, whois_match_score // 3)
+            score_breakdown.whois_bonus = _BONUS_BY_SCORE[max(0, min(100, whois_match_score))]
 
         # Add DNS verification bonus if applicable
         if dns_results:
-            email_a_records = set(dns_results["email_domain"]["a_records"])
-
-            for link in result.get('links', []):
-                link_domain = self.dns_analyzer.get_domain_from_url(link)
-
-                # Temporary DNS lookup for the website
-                try:
-                    # website_a_records = set(self.dns_analyzer.get_a_records(link_domain))
-                    website_a_records = set(dns_results["website_domain"]["a_records"])
-                    # If there's any overlap in A records, it's a good sign they belong to the same organization
-                    if email_a_records.intersection(website_a_records) and email_a_records and website_a_records:
-                        score_breakdown["dns_verification_bonus"] = 10
-                        break
-                except:
-                    pass
-
-                # Check SOA email patterns
+            email_a_records = frozenset(dns_results["email_domain"]["a_records"])
+
+            # Check A record overlap with the website domain, if it was analyzed
+            website_dns_results = dns_results.get("website_domain")
+            # If there's any overlap in A records, it's a good sign they belong to the same organization
+            a_records_overlap = bool(website_dns_results) and not email_a_records.isdisjoint(
+                frozenset(website_dns_results["a_records"]))
+
+            if links and a_records_overlap:
+                score_breakdown.dns_verification_bonus = 10
+            else:
+                # Check SOA email patterns: the SOA contact shares its registered domain with one of the links
                 soa_email = dns_results["email_domain"]["soa_email"]
                 if soa_email:
-                    soa_domain = self.dns_analyzer.get_domain_from_email(soa_email.replace('.', '@', 1))
-                    if soa_domain and (soa_domain in link or link_domain in soa_domain):
-                        score_breakdown["dns_verification_bonus"] = max(score_breakdown["dns_verification_bonus"], 5)
+                    soa_parts = extract_domain(self.dns_analyzer.get_domain_from_email(soa_email.replace('.', '@', 1)))
+                    link_registered_domains = {(result_parts.domain, result_parts.suffix)
+                                               for result_parts in result_parts_list if result_parts.domain}
+                    if (soa_parts.domain, soa_parts.suffix) in link_registered_domains:
+                        score_breakdown.dns_verification_bonus = 5
 
             # Add DNS similarity bonus if both domains were analyzed
             if "website_domain" in dns_results:
                 similarities = self.dns_analyzer.compare_dns_results(dns_results)
                 if similarities:
                     relation_score = similarities["relation_score"]
-                    score_breakdown["dns_similarity_bonus"] = min(30, relation_score // 3)  # Max bonus of 30 points
+                    score_breakdown.dns_similarity_bonus = _BONUS_BY_SCORE[max(0, min(100, relation_score))]
+
+        # Fully Qualified Domain Name Match, checked against every link before any domain scoring
+        result_fqdns = [result_parts.fqdn.removeprefix('www.') for result_parts in result_parts_list]
+        if em_fqdn in result_fqdns:
+            score_breakdown.fully_qualified_domain_name_match = 100
+            score_breakdown.total = 100
+            return score_breakdown
+
+        # Keep each distinct link once, since duplicate links cannot change the score
+        result_links = []
+        seen_links = set()
+        for result_parts in result_parts_list:
+            link_key = (result_parts.subdomain, result_parts.domain, result_parts.suffix)
+            if link_key in seen_links:
+                continue
+            seen_links.add(link_key)
+
+            # Subdomain labels of the link without a leading 'www', for the domain mismatch checks
+            result_subdomain = result_parts.subdomain
+            if result_subdomain.startswith('www.'):
+                result_subdomain = result_subdomain[4:]
+            elif result_subdomain == 'www':
+                result_subdomain = ''
+            result_subdomain_parts = frozenset(result_subdomain.split('.')) if result_subdomain else frozenset()
+
+            result_links.append((result_parts, result_subdomain_parts))
+
+        # The Crossref bonus depends only on the result, not on which link matched
+        has_crossref_id = self.get_crossref_id(result) != 'N/A'
 
         # Domain match check
-        for link in result.get('links', []):
-            result_parts = tldextract.extract(link)
-            result_fqdn = result_parts.fqdn
-
-            if result_fqdn.split('.')[0] == "www":
-                result_fqdn = result_fqdn[4:]
-
-            # Fully Qualified Domain Name Match
-            if email_parts.fqdn == result_fqdn:
-                score_breakdown["fully_qualified_domain_name_match"] = max(
-                    score_breakdown["fully_qualified_domain_name_match"], 100)
-                score_breakdown["total"] = 100
-                return score_breakdown
-
+        for result_parts, result_subdomain_parts in result_links:
             # Domain Match
-            if email_parts.domain == result_parts.domain:
-                score_breakdown["domain_match"] = max(score_breakdown["domain_match"], 80)
+            if em_dom == result_parts.domain:
+                score_breakdown.domain_match = max(score_breakdown.domain_match, 80)
 
                 # Crossref Data Bonus
-                external_ids = result.get('external_ids', {})
-                crossref_id = 'N/A'
-                for external_id in external_ids:
-                    if external_id["type"] == "fundref":
-                        crossref_id = external_id["all"][0]
-                if crossref_id != 'N/A':
-                    score_breakdown["crossref_bonus"] = 5
+                if has_crossref_id:
+                    score_breakdown.crossref_bonus = 5
 
                 # Both Have Subdomains
-                if email_parts.subdomain and (result_parts.subdomain and result_parts.subdomain != "www"):
-                    score_breakdown["subdomain_mismatch"] = min(
-                        score_breakdown["subdomain_mismatch"], -50)
+                if em_sub and (result_parts.subdomain and result_parts.subdomain != "www"):
+                    score_breakdown.subdomain_mismatch = min(
+                        score_breakdown.subdomain_mismatch, -50)
 
                 # Email Has Subdomain
-                if email_parts.subdomain and (not result_parts.subdomain or result_parts.subdomain == "www"):
-                    score_breakdown["email_is_subdomain_of_website_domain"] = max(
-                        score_breakdown["email_is_subdomain_of_website_domain"], 10)
+                if em_sub and (not result_parts.subdomain or result_parts.subdomain == "www"):
+                    score_breakdown.email_is_subdomain_of_website_domain = max(
+                        score_breakdown.email_is_subdomain_of_website_domain, 10)
 
                 # Website Has Subdomain
-                if not email_parts.subdomain and (result_parts.subdomain and result_parts.subdomain != "www"):
-                    score_breakdown["website_is_subdomain_of_email_domain"] = min(
-                        score_breakdown["website_is_subdomain_of_email_domain"], -50)
+                if not em_sub and (result_parts.subdomain and result_parts.subdomain != "www"):
+                    score_breakdown.website_is_subdomain_of_email_domain = min(
+                        score_breakdown.website_is_subdomain_of_email_domain, -50)
 
             # Domain Mismatch
             else:
-                if result_parts.subdomain and email_parts.subdomain:
-                    result_subdomain_parts = result_parts.subdomain.split('.')
-                    if result_fqdn.split('.')[0] == "www":
-                        result_subdomain_parts = result_subdomain_parts[1:]
-
-                    email_subdomain_parts = email_parts.subdomain.split('.')
-
+                if result_parts.subdomain and em_sub:
                     # Domain of Website Matches Subdomain of Email
                     if result_parts.domain in email_subdomain_parts:
-                        score_breakdown["domain_of_website_in_email_subdomain"] = max(
-                            score_breakdown["domain_of_website_in_email_subdomain"], 20)
+                        score_breakdown.domain_of_website_in_email_subdomain = max(
+                            score_breakdown.domain_of_website_in_email_subdomain, 20)
 
                     # Domain of Email Matches Subdomain of Website
-                    if email_parts.domain in result_subdomain_parts:
-                        score_breakdown["domain_of_email_in_website_subdomain"] = max(
-                            score_breakdown["domain_of_email_in_website_subdomain"], 20)
+                    if em_dom in result_subdomain_parts:
+                        score_breakdown.domain_of_email_in_website_subdomain = max(
+                            score_breakdown.domain_of_email_in_website_subdomain, 20)
+
+            # Remaining links cannot change the score once every bound is reached
+            if all(getattr(score_breakdown, key) == bound for key, bound in saturated_scores.items()):
+                break
+
+        score_breakdown.total = min(score_breakdown.fully_qualified_domain_name_match +
+                                    score_breakdown.domain_match +
+                                    score_breakdown.website_is_subdomain_of_email_domain +
+                                    score_breakdown.email_is_subdomain_of_website_domain +
+                                    score_breakdown.subdomain_mismatch +
+                                    score_breakdown.domain_of_email_in_website_subdomain +
+                                    score_breakdown.domain_of_website_in_email_subdomain +
+                                    score_breakdown.crossref_bonus +
+                                    score_breakdown.dns_verification_bonus +
+                                    score_breakdown.dns_similarity_bonus +
+                                    score_breakdown.whois_bonus, 100)
+
+        return score_breakdown
+
+    @staticmethod
+    def get_crossref_id(result):
+        """
+        Get the Crossref (FundRef) identifier of an organization result.
+
+        Handles both the v2 external_ids list of {"type": ..., "all": [...]} entries and
+        the v1 mapping keyed by identifier type.
 
-        score_breakdown["total"] = min(sum(score_breakdown.values()), 100)
+        Parameters:
+            result (dict): Organization result from ROR API containing external_ids.
 
-        return score_breakdown
\ No newline at end of file
+        Returns:
+            str: The organization's FundRef ID, or 'N/A' if it has none.
+        """
+        external_ids = result.get('external_ids') or {}
+        if isinstance(external_ids, dict):
+            fundref = external_ids.get('fundref') or external_ids.get('FundRef')
+        else:
+            fundref = next((external_id for external_id in external_ids
+                            if external_id.get('type') == 'fundref'), None)
+
+        fundref_ids = fundref.get('all') if fundref else None
+        if not fundref_ids:
+            return 'N/A'
+        return fundref_ids if isinstance(fundref_ids, str) else fundref_ids[0]